@@ -0,0 +1,188 @@
+import random
+import threading
+from typing import Any, Dict, List, Optional
+from bson import ObjectId
+
+
+def _matches(doc: dict, query: Optional[dict]) -> bool:
+    """Evaluates the small subset of MongoDB filters the app uses: equality, $in, $ne and $exists."""
+    for field, condition in (query or {}).items():
+        value = doc.get(field)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        if "$in" in condition and value not in condition["$in"]:
+            return False
+        if "$ne" in condition and value == condition["$ne"]:
+            return False
+        if "$exists" in condition and (field in doc) != condition["$exists"]:
+            return False
+    return True
+
+
+def _project(doc: dict, projection: Optional[dict]) -> dict:
+    """Applies an inclusion projection, always keeping _id."""
+    if not projection:
+        return dict(doc)
+    fields = {field for field, include in projection.items() if include}
+    return {key: value for key, value in doc.items() if key == "_id" or key in fields}
+
+
+class FakeInsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class FakeInsertManyResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+
+class FakeUpdateResult:
+    def __init__(self, matched_count: int, modified_count: int, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class FakeDeleteResult:
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+
+
+class FakeCursor:
+    def __init__(self, docs: List[dict]):
+        self._docs = docs
+
+    def limit(self, count: int) -> "FakeCursor":
+        return FakeCursor(self._docs[:count] if count else self._docs)
+
+    def __iter__(self):
+        return iter(self._docs)
+
+
+class FakeCollection:
+    """
+    In-memory stand-in for a pymongo collection, covering only the calls the app makes.
+    """
+
+    def __init__(self, database: "FakeDatabase", name: str):
+        self.database = database
+        self.name = name
+        self._docs: Dict[Any, dict] = {}
+        self._indexes: List[str] = []
+        self._lock = threading.Lock()
+
+    def create_index(self, field: str) -> str:
+        """Records the index; lookups are in-memory scans either way."""
+        name = f"{field}_1"
+        if name not in self._indexes:
+            self._indexes.append(name)
+        return name
+
+    def index_information(self) -> Dict[str, dict]:
+        return {"_id_": {"key": [("_id", 1)]}, **{name: {"key": [(name[:-2], 1)]} for name in self._indexes}}
+
+    def find(self, query: Optional[dict] = None, projection: Optional[dict] = None) -> FakeCursor:
+        with self._lock:
+            if query and set(query) == {"_id"} and not isinstance(query["_id"], dict):
+                docs = [self._docs[query["_id"]]] if query["_id"] in self._docs else []
+            else:
+                docs = [doc for doc in self._docs.values() if _matches(doc, query)]
+            return FakeCursor([_project(doc, projection) for doc in docs])
+
+    def find_one(self, query: Optional[dict] = None, projection: Optional[dict] = None) -> Optional[dict]:
+        return next(iter(self.find(query, projection)), None)
+
+    def insert_one(self, doc: dict) -> FakeInsertOneResult:
+        return FakeInsertOneResult(self.insert_many([doc]).inserted_ids[0])
+
+    def insert_many(self, docs: List[dict]) -> FakeInsertManyResult:
+        inserted_ids = []
+        with self._lock:
+            for doc in docs:
+                doc.setdefault("_id", ObjectId())
+                self._docs[doc["_id"]] = dict(doc)
+                inserted_ids.append(doc["_id"])
+        return FakeInsertManyResult(inserted_ids)
+
+    def estimated_document_count(self) -> int:
+        return len(self._docs)
+
+    def update_one(self, query: dict, update: dict, upsert: bool = False) -> FakeUpdateResult:
+        with self._lock:
+            for doc in self._docs.values():
+                if _matches(doc, query):
+                    return FakeUpdateResult(1, int(self._apply(doc, update)))
+            if not upsert:
+                return FakeUpdateResult(0, 0)
+            doc = {key: value for key, value in query.items() if not isinstance(value, dict)}
+            doc.setdefault("_id", ObjectId())
+            self._apply(doc, update)
+            self._docs[doc["_id"]] = doc
+            return FakeUpdateResult(0, 0, doc["_id"])
+
+    @staticmethod
+    def _apply(doc: dict, update: dict) -> bool:
+        """Applies $set and $inc operators in place and reports whether anything changed."""
+        changes = dict(update.get("$set", {}))
+        for key, amount in update.get("$inc", {}).items():
+            changes[key] = doc.get(key, 0) + amount
+        modified = any(doc.get(key) != value for key, value in changes.items())
+        doc.update(changes)
+        return modified
+
+    def replace_one(self, query: dict, replacement: dict, upsert: bool = False) -> FakeUpdateResult:
+        with self._lock:
+            for key, doc in self._docs.items():
+                if _matches(doc, query):
+                    self._docs[key] = {**replacement, "_id": key}
+                    return FakeUpdateResult(1, 1)
+            if not upsert:
+                return FakeUpdateResult(0, 0)
+            doc = {**query, **replacement}
+            doc.setdefault("_id", ObjectId())
+            self._docs[doc["_id"]] = doc
+            return FakeUpdateResult(0, 0, doc["_id"])
+
+    def delete_one(self, query: dict) -> FakeDeleteResult:
+        with self._lock:
+            for key, doc in self._docs.items():
+                if _matches(doc, query):
+                    del self._docs[key]
+                    return FakeDeleteResult(1)
+            return FakeDeleteResult(0)
+
+    def aggregate(self, pipeline: List[dict]) -> List[dict]:
+        with self._lock:
+            docs = list(self._docs.values())
+        for stage in pipeline:
+            if "$sample" in stage:
+                docs = random.sample(docs, min(stage["$sample"]["size"], len(docs)))
+            else:
+                raise NotImplementedError(f"Unsupported aggregation stage: {stage}")
+        return [dict(doc) for doc in docs]
+
+
+class FakeDatabase:
+    def __init__(self, name: str):
+        self.name = name
+        self._collections: Dict[str, FakeCollection] = {}
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(self, name)
+        return self._collections[name]
+
+
+class FakeMongoClient:
+    """In-memory stand-in for pymongo's MongoClient used by the load tester."""
+
+    def __init__(self):
+        self._databases: Dict[str, FakeDatabase] = {}
+
+    def __getitem__(self, name: str) -> FakeDatabase:
+        if name not in self._databases:
+            self._databases[name] = FakeDatabase(name)
+        return self._databases[name]
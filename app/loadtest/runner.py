@@ -0,0 +1,495 @@
+"""
+Load generator that replays or synthesizes swipe sessions against the API.
+
+Each session logs in through /token, loads the user's profile and then repeats a
+swipe cycle: /vector_search for a recommendation (or /random to explore), a swipe
+decision, /users/update_vector and /swipe/. Requests are paced to a target rate
+that ramps up stage by stage until the API saturates.
+
+By default the app is started in a separate process (app.loadtest.server) on a local
+port with an in-memory Mongo stand-in seeded with synthetic users and events:
+
+    python -m app.loadtest.runner --start-rps 20 --step-rps 20 --stage-seconds 15
+
+Use --url to target an already running server instead; its users must exist with
+the usernames and password given by the sessions file or --user-prefix/--password.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import socket
+import subprocess
+import sys
+import time
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+from app.loadtest.server import CATEGORIES
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class HttpConnection:
+    """
+    Minimal keep-alive HTTP/1.1 client on asyncio streams, one request at a time.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, body: bytes = b"", headers: Optional[dict] = None) -> Tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        try:
+            self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+            await self._writer.drain()
+            return await self._read_response()
+        except BaseException:
+            # Also covers cancellation by a timeout: a late response must not be read by the next request.
+            await self.close()
+            raise
+
+    async def _read_response(self) -> Tuple[int, bytes]:
+        head = await self._reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split(" ")[1])
+        response_headers = {}
+        for line in header_lines:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        else:
+            payload = await self._reader.readexactly(int(response_headers.get("content-length", "0")))
+
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, payload
+
+
+class EndpointStats:
+    """
+    Latencies and failure counts for one endpoint during one stage.
+
+    Failures are split in two. Errors are what a saturated server produces: timeouts,
+    connection failures and 5xx responses. Rejections are 4xx responses, which come from
+    the replayed requests themselves (for example an update that leaves the vector
+    unchanged) and say nothing about capacity.
+    """
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.rejected = 0
+
+    def record(self, latency: float, status: Optional[int]) -> None:
+        """Records one request; `status` is None when no response arrived."""
+        self.latencies.append(latency)
+        if status is None or status >= 500:
+            self.errors += 1
+        elif status >= 400:
+            self.rejected += 1
+
+    def summary(self, duration: float) -> dict:
+        count = len(self.latencies)
+        latencies_ms = np.array(self.latencies) * 1000 if count else np.zeros(1)
+        p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99])
+        return {
+            "requests": count,
+            "rps": count / duration,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "rejected": self.rejected,
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "max_ms": float(latencies_ms.max()),
+        }
+
+
+class Pacer:
+    """Hands out evenly spaced send slots so all workers together issue `rate` requests per second."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next = time.perf_counter()
+
+    async def wait(self) -> None:
+        now = time.perf_counter()
+        slot = max(now, self._next)
+        self._next = slot + 1 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class Stage:
+    """One target rate of the ramp: its pacer, deadline and per-endpoint statistics."""
+
+    def __init__(self, rate: float, duration: float):
+        self.rate = rate
+        self.duration = duration
+        self.pacer = Pacer(rate)
+        self.stats: Dict[str, EndpointStats] = {}
+        self.started = 0.0
+        self.deadline = 0.0
+        self.in_flight = 0
+
+    def begin(self) -> None:
+        self.pacer = Pacer(self.rate)
+        self.started = time.perf_counter()
+        self.deadline = self.started + self.duration
+
+    def record(self, name: str, latency: float, status: Optional[int]) -> None:
+        self.stats.setdefault(name, EndpointStats()).record(latency, status)
+
+    async def drain(self) -> None:
+        """Waits for requests sent during the stage to complete or time out."""
+        while self.in_flight:
+            await asyncio.sleep(0.01)
+
+    def report(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        endpoints = {name: stats.summary(elapsed) for name, stats in sorted(self.stats.items())}
+        total = sum(stats["requests"] for stats in endpoints.values())
+        errors = sum(stats["errors"] for stats in endpoints.values())
+        rejected = sum(stats["rejected"] for stats in endpoints.values())
+        all_latencies = np.concatenate([stats.latencies for stats in self.stats.values()]) * 1000 if total else np.zeros(1)
+        return {
+            "target_rps": self.rate,
+            "achieved_rps": total / elapsed,
+            "requests": total,
+            "error_rate": errors / total if total else 0.0,
+            "rejected_rate": rejected / total if total else 0.0,
+            "p99_ms": float(np.percentile(all_latencies, 99)),
+            "endpoints": endpoints,
+        }
+
+
+class LoadTest:
+    """
+    Keeps `concurrency` workers replaying sessions for the whole ramp and paces them by the current stage.
+
+    Workers, their connections and their logged-in sessions carry over from one stage to
+    the next: between stages they wait for the next one instead of being restarted, so a
+    stage does not open with a burst of /token logins. The latest vector of each user is
+    kept across sessions, since the profile does not return the vector update_vector writes.
+    """
+
+    def __init__(self, host: str, port: int, sessions: Iterator[dict], think_time: float,
+                 swipe: bool = True, timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.sessions = sessions
+        self.think_time = think_time
+        self.swipe = swipe
+        self.timeout = timeout
+        self.vectors: Dict[str, List[float]] = {}
+        self.stage: Optional[Stage] = None
+        self._active = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+
+    async def _enter_stage(self) -> Stage:
+        """Waits for a send slot in the running stage, or for the next stage between stages."""
+        while True:
+            stage = self.stage
+            if stage is None:
+                await self._active.wait()
+                continue
+            await stage.pacer.wait()
+            if stage is self.stage and time.perf_counter() < stage.deadline:
+                stage.in_flight += 1
+                return stage
+
+    async def call(self, connection: HttpConnection, name: str, method: str, path: str,
+                   json_body=None, form=None, token: Optional[str] = None):
+        stage = await self._enter_stage()
+        headers = {}
+        body = b""
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            body = urlencode(form).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        start = time.perf_counter()
+        try:
+            status, payload = await asyncio.wait_for(connection.request(method, path, body, headers), self.timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            stage.record(name, time.perf_counter() - start, None)
+            return None
+        finally:
+            stage.in_flight -= 1
+        stage.record(name, time.perf_counter() - start, status)
+        if not 200 <= status < 300:
+            return None
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+    async def run_session(self, connection: HttpConnection, session: dict) -> None:
+        username = session["username"]
+        login = await self.call(connection, "/token", "POST", "/token",
+                                form={"username": username, "password": session["password"]})
+        token = login["access_token"] if login else None
+        profile = await self.call(connection, "/users/{username}", "GET", f"/users/{username}")
+        vector = self.vectors.get(username) or (profile or {}).get("embedding") or []
+
+        for step, direction in enumerate(session["swipes"]):
+            if step % 5 == 4 or not vector:
+                result = await self.call(connection, "/random", "GET", "/random")
+                event = (result or {}).get("random_cause")
+            else:
+                search = {"user_embedding": vector}
+                if session.get("categories"):
+                    search["categories"] = session["categories"]
+                result = await self.call(connection, "/vector_search", "POST", "/vector_search", json_body=search)
+                event = (result or {}).get("most_similar_cause")
+            if not event:
+                continue
+
+            if vector and event.get("embedded"):
+                updated = await self.call(connection, "/users/update_vector", "POST", "/users/update_vector", json_body={
+                    "username": username,
+                    "user_vector": vector,
+                    "event_vector": event["embedded"],
+                    "swipe": direction == "right",
+                })
+                if updated:
+                    vector = self.vectors[username] = updated["updated_vector"]
+
+            if self.swipe:
+                await self.call(connection, "/swipe/", "POST", "/swipe/", token=token,
+                                json_body={"current_event_id": event.get("_id", ""), "direction": direction})
+            if self.think_time:
+                await asyncio.sleep(random.expovariate(1 / self.think_time))
+
+    async def worker(self) -> None:
+        connection = HttpConnection(self.host, self.port)
+        try:
+            while True:
+                await self.run_session(connection, next(self.sessions))
+        finally:
+            await connection.close()
+
+    def start(self, concurrency: int) -> None:
+        self._workers = [asyncio.create_task(self.worker()) for _ in range(concurrency)]
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        for result in await asyncio.gather(*self._workers, return_exceptions=True):
+            if not isinstance(result, asyncio.CancelledError):
+                logging.error(f"Load test worker failed: {result!r}")
+        self._workers = []
+
+    async def run_stage(self, stage: Stage) -> dict:
+        """Runs the workers at the stage's rate for its duration and reports once its requests have finished."""
+        stage.begin()
+        self.stage = stage
+        self._active.set()
+        await asyncio.sleep(stage.duration)
+        self.stage = None
+        self._active.clear()
+        await stage.drain()
+        return stage.report()
+
+
+def load_sessions(path: str) -> List[dict]:
+    """
+    Loads recorded sessions from a JSON lines file. Each line holds
+    {"username": ..., "password": ..., "swipes": ["left", "right", ...], "categories": [...]}.
+    """
+    with open(path, mode="r", encoding="utf-8") as session_file:
+        return [json.loads(line) for line in session_file if line.strip()]
+
+
+def synthesize_sessions(count: int, user_prefix: str, password: str, users: int, swipes: int,
+                        right_ratio: float, seed: int) -> List[dict]:
+    """
+    Generates sessions for seeded users with random swipe decisions. Users are assigned in
+    turn, so up to `users` consecutive sessions, and so concurrent workers, never share one.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "username": f"{user_prefix}{number % users}",
+            "password": password,
+            "swipes": ["right" if rng.random() < right_ratio else "left" for _ in range(swipes)],
+            "categories": rng.sample(CATEGORIES, 2) if rng.random() < 0.3 else [],
+        }
+        for number in range(count)
+    ]
+
+
+def start_local_app(args) -> Tuple[str, int, subprocess.Popen]:
+    """
+    Starts the API in a separate process against an in-memory Mongo stand-in, so the server
+    does not share the load generator's interpreter and CPU time, and waits until it accepts connections.
+    """
+    command = [
+        sys.executable, "-m", "app.loadtest.server",
+        "--port", str(args.port),
+        "--users", str(args.users),
+        "--events", str(args.events),
+        "--dim", str(args.dim),
+        "--user-prefix", args.user_prefix,
+        "--password", args.password,
+        "--seed", str(args.seed),
+    ]
+    process = subprocess.Popen(command)
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Local app exited with code {process.returncode} during startup.")
+        try:
+            socket.create_connection(("127.0.0.1", args.port), timeout=1).close()
+            return "127.0.0.1", args.port, process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Local app did not start listening on port {args.port} within {args.startup_timeout} seconds.")
+
+
+async def swipe_route_available(host: str, port: int, timeout: float) -> bool:
+    """Checks the server's OpenAPI schema for the /swipe/ route."""
+    connection = HttpConnection(host, port)
+    try:
+        status, payload = await asyncio.wait_for(connection.request("GET", "/openapi.json"), timeout)
+        return status != 200 or "/swipe/" in json.loads(payload).get("paths", {})
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+        return True
+    finally:
+        await connection.close()
+
+
+def print_stage(report: dict) -> None:
+    print(f"\nTarget {report['target_rps']:.0f} rps: achieved {report['achieved_rps']:.1f} rps, "
+          f"{report['requests']} requests, error rate {report['error_rate']:.2%}, "
+          f"rejected {report['rejected_rate']:.2%}, p99 {report['p99_ms']:.1f} ms")
+    print(f"  {'endpoint':<22}{'requests':>9}{'rps':>9}{'errors':>8}{'rejected':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, stats in report["endpoints"].items():
+        print(f"  {name:<22}{stats['requests']:>9}{stats['rps']:>9.1f}{stats['errors']:>8}{stats['rejected']:>9}"
+              f"{stats['p50_ms']:>9.1f}{stats['p90_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+
+
+def saturation_reason(report: dict, args) -> Optional[str]:
+    """
+    Returns why the stage counts as saturated, or None if the API kept up.
+    Only capacity errors count against the error limit, not rejected requests.
+    """
+    if report["achieved_rps"] < args.min_throughput_ratio * report["target_rps"]:
+        return "throughput fell behind the target rate"
+    if report["error_rate"] > args.max_error_rate:
+        return "error rate exceeded the limit"
+    if report["p99_ms"] > args.max_p99_ms:
+        return "p99 latency exceeded the limit"
+    return None
+
+
+async def ramp(host: str, port: int, sessions: List[dict], args) -> List[dict]:
+    """Runs stages at increasing target rates until the API saturates or --max-rps is reached."""
+    if not args.no_swipe and not await swipe_route_available(host, port, args.timeout):
+        logging.warning("The server does not expose /swipe/; skipping /swipe/ requests.")
+        args.no_swipe = True
+
+    load_test = LoadTest(host, port, itertools.cycle(sessions), args.think_time, not args.no_swipe, args.timeout)
+    load_test.start(args.concurrency)
+    reports = []
+    rate = args.start_rps
+    try:
+        while rate <= args.max_rps:
+            report = await load_test.run_stage(Stage(rate, args.stage_seconds))
+            reports.append(report)
+            print_stage(report)
+            reason = saturation_reason(report, args)
+            if reason:
+                print(f"\nSaturated at {rate:.0f} rps: {reason}.")
+                break
+            rate += args.step_rps
+    finally:
+        await load_test.stop()
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay swipe sessions against the API at increasing request rates.")
+    parser.add_argument("--url", help="Base URL of a running server. Starts a local app with a Mongo stand-in if omitted.")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the local app.")
+    parser.add_argument("--sessions", help="JSON lines file of recorded sessions to replay.")
+    parser.add_argument("--users", type=int, default=200, help="Synthetic users to seed and log in as.")
+    parser.add_argument("--events", type=int, default=2000, help="Synthetic events to seed.")
+    parser.add_argument("--dim", type=int, default=64, help="Dimension of seeded embeddings.")
+    parser.add_argument("--user-prefix", default="loadtest-user-", help="Username prefix of the synthetic users.")
+    parser.add_argument("--password", default="loadtest-password", help="Password of the synthetic users.")
+    parser.add_argument("--swipes", type=int, default=20, help="Swipes per synthetic session.")
+    parser.add_argument("--right-ratio", type=float, default=0.4, help="Share of right swipes in synthetic sessions.")
+    parser.add_argument("--no-swipe", action="store_true", help="Do not call /swipe/ after each decision.")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between swipes in seconds.")
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent sessions, kept running across stages.")
+    parser.add_argument("--start-rps", type=float, default=20, help="Target request rate of the first stage.")
+    parser.add_argument("--step-rps", type=float, default=20, help="Target rate increase per stage.")
+    parser.add_argument("--max-rps", type=float, default=2000, help="Highest target rate to try.")
+    parser.add_argument("--stage-seconds", type=float, default=15, help="Duration of each stage.")
+    parser.add_argument("--min-throughput-ratio", type=float, default=0.9, help="Saturated below this share of the target rate.")
+    parser.add_argument("--max-error-rate", type=float, default=0.05, help="Saturated above this error rate.")
+    parser.add_argument("--max-p99-ms", type=float, default=1000, help="Saturated above this p99 latency.")
+    parser.add_argument("--timeout", type=float, default=10, help="Seconds before a request counts as failed.")
+    parser.add_argument("--startup-timeout", type=float, default=60, help="Seconds to wait for the local app to start.")
+    parser.add_argument("--output", help="Write the stage reports to this JSON file.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic data.")
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port, process = start_local_app(args)
+        logging.info(f"Started local app on {host}:{port} with {args.users} users and {args.events} events.")
+
+    if args.sessions:
+        sessions = load_sessions(args.sessions)
+    else:
+        sessions = synthesize_sessions(max(args.users, args.concurrency), args.user_prefix, args.password,
+                                       args.users, args.swipes, args.right_ratio, args.seed)
+
+    try:
+        reports = asyncio.run(ramp(host, port, sessions, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as output_file:
+            json.dump(reports, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Runs the API on an in-memory Mongo stand-in seeded with synthetic users and events.
+
+Started as a separate process by app.loadtest.runner so the server has its own
+interpreter and CPU time; it can also be run by hand:
+
+    python -m app.loadtest.server --port 8765 --users 200 --events 2000
+"""
+import argparse
+import logging
+import os
+import time
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CATEGORIES = ["environment", "education", "health", "animals", "community", "arts", "food security", "seniors"]
+
+
+def seed_database(db, users: int, events: int, dim: int, user_prefix: str, password: str, seed: int) -> None:
+    """Fills the stand-in database with synthetic users and upcoming events."""
+    from app.middleware.auth_functions import get_password_hash
+    from app.services.event_index import parse_event_timestamp
+
+    rng = np.random.default_rng(seed)
+    hashed_password = get_password_hash(password)
+    db["users"].insert_many([
+        {
+            "username": f"{user_prefix}{i}",
+            "hashed_password": hashed_password,
+            "disabled": False,
+            "embedding": rng.standard_normal(dim).tolist(),
+        }
+        for i in range(users)
+    ])
+
+    today = time.time()
+    causes = []
+    for i in range(events):
+        date = time.strftime("%Y-%m-%d", time.localtime(today + rng.integers(0, 60) * 86400))
+        start = f"{rng.integers(8, 20)}:00"
+        causes.append({
+            "name": f"Event {i}",
+            "location": "Chicago, IL",
+            "date": date,
+            "time": start,
+            "description": "Synthetic load test event",
+            "category": rng.choice(CATEGORIES, size=2, replace=False).tolist(),
+            "link": "",
+            "embedded": rng.standard_normal(dim).tolist(),
+            "timestamp": parse_event_timestamp(date, start),
+        })
+    db["events"].insert_many(causes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the API on a seeded in-memory Mongo stand-in.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("--users", type=int, default=200, help="Synthetic users to seed.")
+    parser.add_argument("--events", type=int, default=2000, help="Synthetic events to seed.")
+    parser.add_argument("--dim", type=int, default=64, help="Dimension of seeded embeddings.")
+    parser.add_argument("--user-prefix", default="loadtest-user-", help="Username prefix of the synthetic users.")
+    parser.add_argument("--password", default="loadtest-password", help="Password of the synthetic users.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic data.")
+    args = parser.parse_args()
+
+    import uvicorn
+    os.environ.setdefault("JWT_SECRET", "loadtest-secret")
+    os.environ.setdefault("ALGO", "HS256")
+
+    # Every module fetches its client through app.config.db at import time, so install the stand-in first.
+    from app.config import db as db_config
+    from app.loadtest.fake_mongo import FakeMongoClient
+    client = FakeMongoClient()
+    db_config.get_mongo_client = lambda: client
+
+    from app.main import app
+    seed_database(client["match_cause_db"], args.users, args.events, args.dim, args.user_prefix, args.password, args.seed)
+    logging.info(f"Seeded {args.users} users and {args.events} events.")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class Cause(BaseModel):
     name: str
@@ -10,6 +11,8 @@ class Cause(BaseModel):
     category: List[str]
     link: str
     embedded: List[float] = []
+    timestamp: Optional[float] = None
+    content_hash: Optional[str] = None
     
 class Coordinates(BaseModel):
     lat: float
@@ -21,3 +24,7 @@ class DistanceRequest(BaseModel):
 
 class VectorSearchRequest(BaseModel):
     user_embedding: List[float]
+    categories: List[str] = []
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    upcoming_only: bool = False
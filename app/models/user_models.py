@@ -9,6 +9,7 @@ class User(UserPublic):
     full_name: Optional[str] = None
     address: Optional[str] = None
     dob: Optional[str] = None
+    interests: List[str] = []
     embedding: List[float] = []
 
 class UserInDB(User):
@@ -1,9 +1,14 @@
+import time
 import numpy as np
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.models.cause_models import Coordinates, DistanceRequest, VectorSearchRequest
 from app.config.db import get_mongo_client, get_database
 from app.services.maps_api import geocode_address, calculate_distance
+from app.services.catalog import get_catalog_generation
+from app.services.event_index import get_event_index, normalize_category, to_event_timestamp
+from app.services.compression import RERANK_CANDIDATES
+from app.services.search_cache import search_cache
 from bson import ObjectId
 
 router = APIRouter()
@@ -65,46 +70,101 @@ async def search_event_vector(payload: VectorSearchRequest):
 
     Body Parameters (JSON):
         - **user_embedding**: A list of float values representing the user's embedding vector
+        - **categories**: Optional list of categories; events must be tagged with at least one
+        - **start_date**: Optional earliest event date and time
+        - **end_date**: Optional latest event date and time
+        - **upcoming_only**: Only consider events that have not started yet
 
-    This function retrieves up to 100 events from the "events" collection, computes the cosine similarity
-    between the provided embedding and each event's 'embedded' field, and returns the closest match.
+    Candidate events are selected from the in-memory event index by intersecting the category and
+    date filters, then scored by cosine similarity against the provided embedding.
+    Results are cached per quantized embedding and filters until new events are imported.
     """
     try:
-        causes_collection = db["events"]
-        
-        docs = list(causes_collection.find().limit(100))
-        if not docs:
-            return {"message": "No cause found in the database."}
-        
-        user_embedding = np.array(payload.user_embedding)
-        user_norm = np.linalg.norm(user_embedding)
-        best_doc = None
-        best_similarity = -1
-
-        for doc in docs:
-            candidate = doc.get("embedded")
-            if candidate is None:
-                continue
-            
-            candidate_embedding = np.array(candidate)
-            candidate_norm = np.linalg.norm(candidate_embedding)
-            
-            if user_norm == 0 or candidate_norm == 0:
-                similarity = -1
-            else:
-                similarity = np.dot(user_embedding, candidate_embedding) / (user_norm * candidate_norm)
-            
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_doc = doc
-        
-        if best_doc is None:
-            return {"message": "No cause found matching the provided embedding."}
-        
-        return {"most_similar_cause": parse_object_ids(best_doc), "similarity": best_similarity}
+        start, end = _resolve_date_filters(payload)
+        cache_key = search_cache.make_key(
+            payload.user_embedding,
+            categories=sorted(normalize_category(c) for c in payload.categories),
+            start=start,
+            end=end,
+        )
+        generation = get_catalog_generation(db)
+        cached = search_cache.get(cache_key, generation)
+        if cached is not None:
+            return cached
+
+        result = _search_event_vector(payload.user_embedding, payload.categories, start, end, generation)
+        search_cache.put(cache_key, result, generation)
+        return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
-    
+
+def _resolve_date_filters(payload: VectorSearchRequest):
+    """
+    Converts the request's date filters into a (start, end) pair of timestamps.
+    Naive datetimes are read in the event timezone, like the catalog's own dates.
+    "Upcoming" is rounded down to the minute so repeated searches share a cache entry.
+    """
+    start = to_event_timestamp(payload.start_date) if payload.start_date else None
+    end = to_event_timestamp(payload.end_date) if payload.end_date else None
+    if payload.upcoming_only:
+        now = float(int(time.time()) // 60 * 60)
+        start = now if start is None else max(start, now)
+    return start, end
+
+def _search_event_vector(user_embedding, categories, start, end, generation) -> dict:
+    """
+    Computes the vector search result for the filters, bypassing the cache.
+    """
+    causes_collection = db["events"]
+
+    index = get_event_index(causes_collection, generation)
+    if index.size == 0:
+        return {"message": "No cause found in the database."}
+
+    user_embedding = np.asarray(user_embedding, dtype=np.float32)
+    user_norm = np.linalg.norm(user_embedding)
+    candidates = index.candidates(categories, start, end)
+    if user_norm == 0 or len(candidates) == 0:
+        return {"message": "No cause found matching the provided embedding."}
+    if user_embedding.shape[0] != index.dim:
+        raise ValueError(f"Embedding has {user_embedding.shape[0]} dimensions, expected {index.dim}.")
+
+    query = user_embedding / user_norm
+    similarities = index.score(candidates, query)
+    if not index.is_approximate:
+        best = int(np.argmax(similarities))
+        best_doc = causes_collection.find_one({"_id": index.ids[candidates[best]]})
+        if best_doc is None:
+            return {"message": "No cause found matching the provided embedding."}
+        return {"most_similar_cause": parse_object_ids(best_doc), "similarity": float(similarities[best])}
+
+    # Compressed scores only shortlist candidates; re-rank the shortlist in full precision.
+    shortlist_size = min(RERANK_CANDIDATES, len(candidates))
+    shortlist = candidates[np.argpartition(-similarities, shortlist_size - 1)[:shortlist_size]]
+    best_doc = None
+    best_similarity = -1
+    for doc in causes_collection.find({"_id": {"$in": [index.ids[o] for o in shortlist]}}):
+        candidate = np.asarray(doc.get("embedded") or [], dtype=np.float32)
+        candidate_norm = np.linalg.norm(candidate)
+        if candidate.shape != query.shape or candidate_norm == 0:
+            continue
+        similarity = float(candidate @ query / candidate_norm)
+        if similarity > best_similarity:
+            best_similarity = similarity
+            best_doc = doc
+
+    if best_doc is None:
+        return {"message": "No cause found matching the provided embedding."}
+
+    return {"most_similar_cause": parse_object_ids(best_doc), "similarity": best_similarity}
+
+@router.get("/vector_search/cache_stats", tags=["causes"])
+async def vector_search_cache_stats():
+    """
+    Report size, hit rate and eviction metrics for the vector search result cache.
+    """
+    return search_cache.stats()
+
 @router.get("/random", tags=["causes"])
 async def get_random_cause():
     """
@@ -6,6 +6,7 @@ from app.users.user_functions import get_user, get_users
 from app.models.user_models import User, UserPublic, UserRegistering, UpdateVectorRequest
 from app.middleware.auth_functions import get_password_hash
 from app.services.learning import update_user_embedded_vector
+from app.services.text_embedding import catalog_text_dim, embed_interests
 from app.config.db import get_mongo_client, get_database
 
 router = APIRouter()
@@ -44,6 +45,12 @@ async def register(user: UserRegistering):
     user_dict.pop("password")
     user_dict["disabled"] = False
 
+    # Start new users from their declared interests when the events are embedded from text too.
+    if not user_dict["embedding"] and user_dict["interests"]:
+        dim = catalog_text_dim(db["events"])
+        if dim:
+            user_dict["embedding"] = embed_interests(user_dict["interests"], dim)
+
     result = db["users"].insert_one(user_dict)
     user_dict["_id"] = str(result.inserted_id)
     
@@ -0,0 +1,45 @@
+import logging
+import threading
+import time
+from app.utils.load_env import get_catalog_generation_ttl
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+GENERATION_ID = "catalog_generation"
+
+_lock = threading.Lock()
+_cached = None
+
+def get_catalog_generation(db) -> tuple:
+    """
+    Returns the current generation of the events catalog.
+
+    The generation pairs a counter stored in the "models" collection, incremented by every
+    import, with the estimated number of events, so inserts made by other workers, scripts
+    or directly in MongoDB are noticed too. Anything derived from the catalog (cached search
+    results, indexes) compares generations to tell when it is stale. Reads are reused for
+    CATALOG_GENERATION_TTL seconds to keep the check cheap.
+    """
+    global _cached
+    now = time.monotonic()
+    cached = _cached
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    doc = db["models"].find_one({"_id": GENERATION_ID})
+    generation = (doc["value"] if doc else 0, db["events"].estimated_document_count())
+    with _lock:
+        _cached = (now + get_catalog_generation_ttl(), generation)
+    return generation
+
+def bump_catalog_generation(db) -> tuple:
+    """
+    Marks the events catalog as changed for every process and returns the new generation.
+    """
+    global _cached
+    db["models"].update_one({"_id": GENERATION_ID}, {"$inc": {"value": 1}}, upsert=True)
+    with _lock:
+        _cached = None
+    generation = get_catalog_generation(db)
+    logging.info(f"Events catalog generation is now {generation}.")
+    return generation
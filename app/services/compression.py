@@ -0,0 +1,215 @@
+import logging
+import numpy as np
+from typing import Optional
+from app.utils.load_env import get_embedding_pca_dim, get_embedding_quantize, get_rerank_candidates
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+COMPRESSOR_ID = "embedding_compressor"
+SCORE_CHUNK_ROWS = 4096
+# Read once so a bad EMBEDDING_RERANK_CANDIDATES fails at startup rather than on every search.
+RERANK_CANDIDATES = get_rerank_candidates()
+
+
+class EmbeddingCompressor:
+    """
+    Compresses unit-normalized embeddings with PCA and/or int8 scalar quantization.
+
+    Events are stored as the projection of their centered vector onto the principal
+    components. Queries are projected without centering: the mean only adds the same
+    offset to every candidate's score, so the ranking is unchanged.
+    """
+
+    def __init__(self, mean: np.ndarray, components: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = None if components is None else np.asarray(components, dtype=np.float32)
+        self.scale = None if scale is None else np.asarray(scale, dtype=np.float32)
+
+    @property
+    def input_dim(self) -> int:
+        return self.mean.shape[0]
+
+    @property
+    def output_dim(self) -> int:
+        return self.input_dim if self.components is None else self.components.shape[0]
+
+    @property
+    def shrinks(self) -> bool:
+        """Whether encoding reduces the embeddings at all. A centering-only compressor is exact."""
+        return self.components is not None or self.scale is not None
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, dim: int = 0, quantize: bool = False) -> "EmbeddingCompressor":
+        """
+        Fits the compressor on a matrix of unit-normalized embeddings.
+
+        Args:
+            vectors (np.ndarray): Training embeddings, one per row.
+            dim (int): Number of principal components to keep, 0 to skip PCA.
+            quantize (bool): Whether to quantize the projected values to int8.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        mean = vectors.mean(axis=0)
+        components = None
+        if dim and dim < vectors.shape[1]:
+            _, _, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+            components = vt[:dim]
+
+        compressor = cls(mean, components)
+        if quantize:
+            projected = compressor.project(vectors, center=True)
+            max_abs = np.abs(projected).max(axis=0)
+            compressor.scale = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+        return compressor
+
+    def project(self, vectors: np.ndarray, center: bool) -> np.ndarray:
+        """Projects embeddings onto the principal components, centering them first if asked."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if center:
+            vectors = vectors - self.mean
+        if self.components is None:
+            return vectors
+        return vectors @ self.components.T
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Encodes event embeddings into their compressed, resident form."""
+        projected = self.project(vectors, center=True)
+        if self.scale is None:
+            return projected.astype(np.float32)
+        return np.clip(np.rint(projected / self.scale), -127, 127).astype(np.int8)
+
+    def score(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """
+        Returns approximate similarities between encoded events and a unit-normalized query.
+
+        Quantization scales are folded into the query. NumPy has no int8 matrix product, so
+        int8 codes are converted to float32 SCORE_CHUNK_ROWS rows at a time into one reused
+        buffer instead of upcasting the whole code matrix on every query.
+        """
+        projected = self.project(query, center=False)
+        if self.scale is None:
+            return codes @ projected
+        projected = projected * self.scale
+
+        scores = np.empty(len(codes), dtype=np.float32)
+        buffer = np.empty((min(SCORE_CHUNK_ROWS, len(codes)), codes.shape[1]), dtype=np.float32)
+        for start in range(0, len(codes), SCORE_CHUNK_ROWS):
+            block = codes[start:start + SCORE_CHUNK_ROWS]
+            np.copyto(buffer[:len(block)], block, casting="unsafe")
+            np.matmul(buffer[:len(block)], projected, out=scores[start:start + len(block)])
+        return scores
+
+    def to_document(self) -> dict:
+        """Serializes the compressor for storage in MongoDB."""
+        return {
+            "_id": COMPRESSOR_ID,
+            "mean": self.mean.tolist(),
+            "components": None if self.components is None else self.components.tolist(),
+            "scale": None if self.scale is None else self.scale.tolist(),
+        }
+
+    @classmethod
+    def from_document(cls, doc: dict) -> "EmbeddingCompressor":
+        """Restores a compressor stored with to_document."""
+        return cls(doc["mean"], doc.get("components"), doc.get("scale"))
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scales each row to unit length, leaving zero rows untouched."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def measure_recall(compressor: EmbeddingCompressor, vectors: np.ndarray, k: int = 10,
+                   rerank: int = 50, sample: int = 200, seed: int = 0) -> dict:
+    """
+    Measures how well compressed scoring preserves exact cosine ranking on the catalog itself.
+    Each sampled query's own row is excluded from both rankings, so a vector never counts as
+    its own nearest neighbour.
+
+    Returns:
+        dict: 'recall_at_k' is the overlap between the approximate and exact top-k, and
+        'rerank_recall' the fraction of queries whose exact best match survives into the
+        approximate top-`rerank` candidates that are re-ranked in full precision.
+    """
+    vectors = normalize_rows(np.asarray(vectors, dtype=np.float32))
+    rng = np.random.default_rng(seed)
+    if len(vectors) < 2:
+        return {"recall_at_k": 1.0, "rerank_recall": 1.0, "k": 0, "rerank": 0}
+    query_rows = rng.choice(len(vectors), size=min(sample, len(vectors)), replace=False)
+    codes = compressor.encode(vectors)
+    k = min(k, len(vectors) - 1)
+    rerank = min(rerank, len(vectors) - 1)
+
+    overlap = 0.0
+    kept = 0
+    for row in query_rows:
+        query = vectors[row]
+        exact = vectors @ query
+        approx = compressor.score(codes, query)
+        exact[row] = -np.inf
+        approx[row] = -np.inf
+        exact_top = np.argpartition(-exact, k - 1)[:k]
+        approx_top = np.argpartition(-approx, k - 1)[:k]
+        overlap += len(np.intersect1d(exact_top, approx_top)) / k
+        kept += int(np.argmax(exact) in np.argpartition(-approx, rerank - 1)[:rerank])
+
+    return {
+        "recall_at_k": overlap / len(query_rows),
+        "rerank_recall": kept / len(query_rows),
+        "k": k,
+        "rerank": rerank,
+    }
+
+
+def load_compressor(db) -> Optional[EmbeddingCompressor]:
+    """
+    Loads the stored embedding compressor, if compression is enabled and one has been fitted.
+    A stored compressor that does not shrink the embeddings is ignored.
+    """
+    if db is None or not (get_embedding_pca_dim() or get_embedding_quantize()):
+        return None
+    doc = db["models"].find_one({"_id": COMPRESSOR_ID})
+    compressor = EmbeddingCompressor.from_document(doc) if doc else None
+    return compressor if compressor is not None and compressor.shrinks else None
+
+
+def fit_catalog_compressor(db) -> Optional[dict]:
+    """
+    Fits the embedding compressor on every event embedding in the catalog and stores it.
+    Does nothing when neither PCA nor quantization is configured, and removes any stored
+    compressor when the settings would not shrink the embeddings (EMBEDDING_PCA_DIM at or
+    above their dimension without quantization), so searches stay exact.
+
+    Returns:
+        Optional[dict]: The compression settings and measured recall, or None if nothing is compressed.
+    """
+    dim = get_embedding_pca_dim()
+    quantize = get_embedding_quantize()
+    if not dim and not quantize:
+        return None
+
+    embeddings = [doc["embedded"] for doc in db["events"].find({}, {"embedded": 1}) if doc.get("embedded")]
+    if not embeddings:
+        return None
+    input_dim = len(embeddings[0])
+    vectors = normalize_rows(np.array([e for e in embeddings if len(e) == input_dim], dtype=np.float32))
+
+    compressor = EmbeddingCompressor.fit(vectors, dim=dim, quantize=quantize)
+    if not compressor.shrinks:
+        db["models"].delete_one({"_id": COMPRESSOR_ID})
+        logging.info(f"EMBEDDING_PCA_DIM={dim} does not reduce {input_dim}-dimensional embeddings; compression skipped.")
+        return None
+    recall = measure_recall(compressor, vectors, rerank=RERANK_CANDIDATES)
+    db["models"].replace_one({"_id": COMPRESSOR_ID}, compressor.to_document(), upsert=True)
+
+    bytes_per_event = compressor.output_dim * (1 if compressor.scale is not None else 4)
+    report = {
+        "input_dim": input_dim,
+        "output_dim": compressor.output_dim,
+        "quantized": compressor.scale is not None,
+        "compression_ratio": input_dim * 4 / bytes_per_event,
+        **recall,
+    }
+    logging.info(f"Fitted embedding compressor: {report}")
+    return report
@@ -0,0 +1,222 @@
+import logging
+import threading
+import numpy as np
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo
+from app.services.catalog import get_catalog_generation
+from app.services.compression import EmbeddingCompressor, load_compressor
+from app.utils.load_env import get_event_timezone
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%B %d, %Y", "%b %d, %Y", "%A, %B %d, %Y"]
+TIME_FORMATS = ["%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M%p", "%I %p", "%I%p"]
+
+
+def to_event_timestamp(moment: datetime) -> float:
+    """
+    Converts a datetime into a POSIX timestamp, reading naive values as wall-clock time
+    in the configured EVENT_TIMEZONE rather than the server's local timezone.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=ZoneInfo(get_event_timezone()))
+    return moment.timestamp()
+
+
+def parse_event_timestamp(date: str, time: str = "") -> Optional[float]:
+    """
+    Normalizes an event's free-form date and time strings into a POSIX timestamp.
+    Both are read as wall-clock time in the configured EVENT_TIMEZONE.
+
+    Returns:
+        Optional[float]: The timestamp, or None if the date cannot be parsed.
+        An unparseable time falls back to midnight of the parsed date.
+    """
+    if not date:
+        return None
+    day = None
+    for fmt in DATE_FORMATS:
+        try:
+            day = datetime.strptime(date.strip(), fmt)
+            break
+        except ValueError:
+            continue
+    if day is None:
+        return None
+
+    start = (time or "").split("-")[0].strip().upper()
+    for fmt in TIME_FORMATS:
+        try:
+            clock = datetime.strptime(start, fmt)
+            day = day.replace(hour=clock.hour, minute=clock.minute, second=clock.second)
+            break
+        except ValueError:
+            continue
+    return to_event_timestamp(day)
+
+
+def normalize_category(category: str) -> str:
+    """Normalizes a category name for interning and lookups."""
+    return category.strip().lower()
+
+
+def ordinals_to_bitset(ordinals: Iterable[int], size: int) -> int:
+    """Packs event ordinals into an integer bitset."""
+    flags = np.zeros(size, dtype=bool)
+    flags[np.asarray(list(ordinals), dtype=np.int64)] = True
+    return int.from_bytes(np.packbits(flags, bitorder="little").tobytes(), "little")
+
+
+def bitset_to_ordinals(bits: int, size: int) -> np.ndarray:
+    """Unpacks an integer bitset into a sorted array of event ordinals."""
+    raw = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little")[:size])
+
+
+class CategoryVocabulary:
+    """
+    Interns category names to bit positions in the index's postings.
+    """
+
+    def __init__(self):
+        self.bits: Dict[str, int] = {}
+
+    def intern(self, category: str) -> int:
+        """Returns the bit position for the category, assigning a new one if needed."""
+        name = normalize_category(category)
+        if name not in self.bits:
+            self.bits[name] = len(self.bits)
+        return self.bits[name]
+
+
+class EventIndex:
+    """
+    In-memory index over the events catalog used to generate vector search candidates.
+
+    Each event gets an ordinal. Categories are interned and the ordinals collected into an
+    inverted index from category to a bitset of ordinals. The index also keeps
+    a sorted array of event timestamps and a matrix of unit-normalized embeddings. Filters
+    are resolved to bitsets and intersected before any scoring happens.
+
+    With a compressor, only the compressed embeddings stay resident and scores are
+    approximate; callers re-rank the best candidates against the stored full-precision vectors.
+    """
+
+    def __init__(self, docs: List[dict], generation, compressor: Optional[EmbeddingCompressor] = None):
+        self.generation = generation
+        self.size = len(docs)
+        self.ids = [doc["_id"] for doc in docs]
+        self.vocabulary = CategoryVocabulary()
+
+        postings: Dict[int, List[int]] = {}
+        for ordinal, doc in enumerate(docs):
+            for bit in {self.vocabulary.intern(category) for category in doc.get("category") or []}:
+                postings.setdefault(bit, []).append(ordinal)
+        self.postings = {bit: ordinals_to_bitset(ordinals, self.size) for bit, ordinals in postings.items()}
+
+        timestamps = np.array([self._timestamp(doc) for doc in docs], dtype=np.float64)
+        dated = np.flatnonzero(~np.isnan(timestamps))
+        order = np.argsort(timestamps[dated], kind="stable")
+        self.date_ordinals = dated[order]
+        self.date_values = timestamps[self.date_ordinals]
+
+        self.dim = next((len(doc["embedded"]) for doc in docs if doc.get("embedded")), 0)
+        self.vectors = np.zeros((self.size, self.dim), dtype=np.float32)
+        with_vector = []
+        for ordinal, doc in enumerate(docs):
+            candidate = doc.get("embedded") or []
+            if len(candidate) != self.dim:
+                continue
+            vector = np.asarray(candidate, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm == 0:
+                continue
+            self.vectors[ordinal] = vector / norm
+            with_vector.append(ordinal)
+        self.searchable = ordinals_to_bitset(with_vector, self.size)
+
+        self.compressor = compressor if compressor is not None and compressor.input_dim == self.dim else None
+        if self.compressor is not None:
+            self.vectors = self.compressor.encode(self.vectors)
+
+    @property
+    def is_approximate(self) -> bool:
+        """Whether scores come from compressed embeddings and need re-ranking."""
+        return self.compressor is not None
+
+    def score(self, ordinals: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """
+        Returns the similarity of each event ordinal to a unit-normalized query.
+        When most events are candidates, the whole matrix is scored in place and the
+        candidates picked afterwards, which is cheaper than gathering their rows first.
+        """
+        dense = 2 * len(ordinals) > self.size
+        vectors = self.vectors if dense else self.vectors[ordinals]
+        if self.compressor is not None:
+            scores = self.compressor.score(vectors, query)
+        else:
+            scores = vectors @ query
+        return scores[ordinals] if dense else scores
+
+    @staticmethod
+    def _timestamp(doc: dict) -> float:
+        timestamp = doc.get("timestamp")
+        if timestamp is None:
+            timestamp = parse_event_timestamp(doc.get("date", ""), doc.get("time", ""))
+        return np.nan if timestamp is None else timestamp
+
+    def category_bitset(self, categories: List[str]) -> int:
+        """Returns the bitset of events tagged with any of the categories."""
+        bits = 0
+        for category in categories:
+            bit = self.vocabulary.bits.get(normalize_category(category))
+            if bit is not None:
+                bits |= self.postings.get(bit, 0)
+        return bits
+
+    def date_bitset(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """Returns the bitset of events whose timestamp lies within [start, end]."""
+        lo = 0 if start is None else np.searchsorted(self.date_values, start, side="left")
+        hi = len(self.date_values) if end is None else np.searchsorted(self.date_values, end, side="right")
+        return ordinals_to_bitset(self.date_ordinals[lo:hi], self.size)
+
+    def candidates(
+        self,
+        categories: Optional[List[str]] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Returns the ordinals of searchable events that pass every filter.
+        """
+        bits = self.searchable
+        if categories:
+            bits &= self.category_bitset(categories)
+        if start is not None or end is not None:
+            bits &= self.date_bitset(start, end)
+        return bitset_to_ordinals(bits, self.size)
+
+
+_index: Optional[EventIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_event_index(collection, generation=None) -> EventIndex:
+    """
+    Returns the index for the events collection, rebuilding it when the catalog generation changed.
+    """
+    global _index
+    if generation is None:
+        generation = get_catalog_generation(collection.database)
+    if _index is not None and _index.generation == generation:
+        return _index
+    with _index_lock:
+        if _index is None or _index.generation != generation:
+            docs = list(collection.find({}, {"embedded": 1, "category": 1, "date": 1, "time": 1, "timestamp": 1}))
+            _index = EventIndex(docs, generation, load_compressor(collection.database))
+            logging.info(
+                f"Built event index over {_index.size} events for catalog generation {generation} "
+                f"({_index.vectors.nbytes} embedding bytes resident)."
+            )
+        return _index
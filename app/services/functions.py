@@ -1,8 +1,14 @@
 import csv
 import json
+import logging
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.models.cause_models import Cause
 from app.config.db import get_mongo_client, get_database
+from app.services.catalog import bump_catalog_generation
+from app.services.compression import fit_catalog_compressor
+from app.services.event_index import parse_event_timestamp
+from app.services.text_embedding import fill_missing_embeddings
 
 router = APIRouter()
 
@@ -39,6 +45,9 @@ async def import_csv_endpoint(csv_file_path: str):
                 else:
                     row["embedded"] = []
 
+                # Normalize the free-form 'date' and 'time' fields into a timestamp for date filtering.
+                row["timestamp"] = parse_event_timestamp(row.get("date", ""), row.get("time", ""))
+
                 # Validate using the Cause model
                 try:
                     cause = Cause(**row)
@@ -48,9 +57,30 @@ async def import_csv_endpoint(csv_file_path: str):
 
         if not causes:
             raise HTTPException(status_code=400, detail="No valid data to insert.")
+
+        # Events without an 'embedded' vector are embedded locally from their text
+        # when the catalog's embeddings come from the same pipeline.
+        fill_missing_embeddings(causes, causes_collection)
         
         # Insert validated documents into MongoDB
         result = causes_collection.insert_many(causes)
-        return {"message": f"Inserted {len(result.inserted_ids)} documents into the database."}
+        bump_catalog_generation(db)
+
+        response = {"message": f"Inserted {len(result.inserted_ids)} documents into the database."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    # The rows are committed at this point, so a failed refit must not fail the import:
+    # a client retrying a 500 would insert them twice. The SVD and recall pass run off the event loop.
+    try:
+        compression = await run_in_threadpool(fit_catalog_compressor, db)
+    except Exception as e:
+        logging.error(f"Embedding compressor refit failed after import: {e}")
+        response["compression"] = {"error": str(e)}
+        return response
+
+    # Invalidate again so the next index build uses the new compressor.
+    if compression:
+        bump_catalog_generation(db)
+        response["compression"] = compression
+    return response
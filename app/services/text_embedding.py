@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import re
+import zlib
+import numpy as np
+from functools import lru_cache
+from typing import List, Optional
+from app.utils.load_env import get_text_embedding_dim
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+HASH_FEATURES = 2 ** 12
+PROJECTION_SEED = 2025
+EMBED_CHUNK_ROWS = 512
+# Part of every content hash; bump it whenever tokenization, weighting or the projection
+# changes so embeddings cached under the old pipeline are not reused.
+PIPELINE_VERSION = 1
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+@lru_cache(maxsize=8)
+def _projection(dim: int) -> np.ndarray:
+    """
+    Returns the fixed Gaussian random projection from hashed features to `dim` dimensions.
+    The seed is constant so every process produces the same embedding for the same text.
+    """
+    rng = np.random.default_rng(PROJECTION_SEED)
+    return (rng.standard_normal((HASH_FEATURES, dim)) / np.sqrt(dim)).astype(np.float32)
+
+
+def event_text(cause: dict) -> str:
+    """Builds the text an event is embedded from."""
+    return " ".join([cause.get("name", ""), cause.get("description", ""), " ".join(cause.get("category") or [])])
+
+
+def content_hash(text: str, dim: int) -> str:
+    """Returns the cache key for the embedding of `text` at `dim` dimensions under this pipeline version."""
+    return hashlib.sha256(f"{PIPELINE_VERSION}:{dim}:{text}".encode("utf-8")).hexdigest()
+
+
+def embed_texts(texts: List[str], dim: Optional[int] = None) -> np.ndarray:
+    """
+    Embeds a batch of texts with hashed, sublinear term frequencies followed by a random projection.
+
+    Tokens are hashed into HASH_FEATURES signed buckets, the term frequencies are
+    log-scaled and the resulting sparse vectors are projected down to `dim` dimensions.
+    No statistics are shared across the batch, so a text's embedding depends only on
+    the text itself and can be cached by its content hash.
+
+    Texts are processed EMBED_CHUNK_ROWS at a time through one reused term-frequency
+    buffer, so memory stays bounded however many texts are embedded at once.
+
+    Returns:
+        np.ndarray: One unit-length row per text (all zeros for texts without tokens).
+    """
+    dim = dim or get_text_embedding_dim()
+    projection = _projection(dim)
+    embedded = np.zeros((len(texts), dim), dtype=np.float32)
+    counts = np.zeros((min(EMBED_CHUNK_ROWS, len(texts)), HASH_FEATURES), dtype=np.float32)
+    for start in range(0, len(texts), EMBED_CHUNK_ROWS):
+        chunk = texts[start:start + EMBED_CHUNK_ROWS]
+        rows, cols, signs = [], [], []
+        for row, text in enumerate(chunk):
+            for token in TOKEN_PATTERN.findall(text.lower()):
+                digest = zlib.crc32(token.encode("utf-8"))
+                rows.append(row)
+                cols.append(digest % HASH_FEATURES)
+                signs.append(1.0 if digest & 0x80000000 else -1.0)
+
+        block = counts[:len(chunk)]
+        block.fill(0)
+        np.add.at(block, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)), np.array(signs, dtype=np.float32))
+        np.copysign(np.log1p(np.abs(block)), block, out=block)
+        np.matmul(block, projection, out=embedded[start:start + len(chunk)])
+
+    norms = np.linalg.norm(embedded, axis=1, keepdims=True)
+    embedded /= np.where(norms == 0, 1, norms)
+    return embedded
+
+
+def catalog_text_dim(collection) -> Optional[int]:
+    """
+    Returns the dimension text embeddings need to share the event catalog's embedding space.
+
+    Returns:
+        Optional[int]: The dimension of the catalog's text embeddings, the configured
+        dimension if no event has an embedding yet, or None if the catalog holds
+        embeddings from another model, which text embeddings cannot be compared with.
+    """
+    doc = collection.find_one({"embedded": {"$exists": True, "$ne": []}}, {"embedded": 1, "content_hash": 1})
+    if doc is None:
+        return get_text_embedding_dim()
+    if not doc.get("content_hash"):
+        return None
+    return len(doc["embedded"])
+
+
+def embed_interests(interests: List[str], dim: Optional[int] = None) -> List[float]:
+    """Derives an initial user embedding from the user's declared interests."""
+    return embed_texts([" ".join(interests)], dim)[0].tolist()
+
+
+def fill_missing_embeddings(causes: List[dict], collection) -> int:
+    """
+    Embeds every cause without an 'embedded' vector from its name, description and categories.
+
+    This only happens when the catalog's vectors come from this pipeline (or it has none yet):
+    if the batch or the catalog carries embeddings from another model, causes without one are
+    left empty rather than mixed into an incompatible space.
+
+    Each embedded cause gets a 'content_hash'. Vectors already stored for the same hash in
+    `collection` are reused, so re-importing the same events does not recompute them; the
+    rest are embedded together in a single batch. The lookup is backed by an index on
+    'content_hash', created here if it does not exist yet.
+
+    Returns:
+        int: The number of texts that had to be embedded.
+    """
+    missing = [cause for cause in causes if not cause.get("embedded")]
+    if not missing:
+        return 0
+    dim = None if len(missing) < len(causes) else catalog_text_dim(collection)
+    if dim is None:
+        logging.warning(f"Not embedding {len(missing)} events from text: the catalog uses embeddings from another model.")
+        return 0
+
+    texts = {}
+    for cause in missing:
+        text = event_text(cause)
+        cause["content_hash"] = content_hash(text, dim)
+        texts[cause["content_hash"]] = text
+
+    collection.create_index("content_hash")
+    vectors = {}
+    for doc in collection.find({"content_hash": {"$in": list(texts)}}, {"content_hash": 1, "embedded": 1}):
+        if doc.get("embedded"):
+            vectors[doc["content_hash"]] = doc["embedded"]
+
+    pending = [key for key in texts if key not in vectors]
+    if pending:
+        for key, vector in zip(pending, embed_texts([texts[key] for key in pending], dim)):
+            vectors[key] = vector.tolist()
+
+    for cause in missing:
+        cause["embedded"] = vectors[cause["content_hash"]]
+    logging.info(f"Embedded {len(pending)} event texts, reused {len(texts) - len(pending)} cached embeddings.")
+    return len(pending)
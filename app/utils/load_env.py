@@ -15,4 +15,39 @@ def get_JWT_key():
 
 def get_algo():
     load_dotenv()
-    return os.getenv("ALGO")
\ No newline at end of file
+    return os.getenv("ALGO")
+
+def get_search_cache_size():
+    load_dotenv()
+    return int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+
+def get_search_cache_bits():
+    load_dotenv()
+    return int(os.getenv("SEARCH_CACHE_BITS", "32"))
+
+def get_catalog_generation_ttl():
+    load_dotenv()
+    return float(os.getenv("CATALOG_GENERATION_TTL", "1.0"))
+
+def get_event_timezone():
+    load_dotenv()
+    return os.getenv("EVENT_TIMEZONE", "America/Chicago")
+
+def get_embedding_pca_dim():
+    load_dotenv()
+    return int(os.getenv("EMBEDDING_PCA_DIM", "0"))
+
+def get_embedding_quantize():
+    load_dotenv()
+    return os.getenv("EMBEDDING_QUANTIZE", "false").lower() in ("1", "true", "yes")
+
+def get_rerank_candidates():
+    load_dotenv()
+    candidates = int(os.getenv("EMBEDDING_RERANK_CANDIDATES", "50"))
+    if candidates < 1:
+        raise ValueError("EMBEDDING_RERANK_CANDIDATES must be at least 1.")
+    return candidates
+
+def get_text_embedding_dim():
+    load_dotenv()
+    return int(os.getenv("TEXT_EMBEDDING_DIM", "128"))
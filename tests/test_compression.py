@@ -0,0 +1,80 @@
+import asyncio
+import numpy as np
+from app.loadtest.fake_mongo import FakeMongoClient
+from app.services import compression, functions
+from app.services.compression import EmbeddingCompressor, measure_recall, normalize_rows
+
+
+def make_vectors(n=300, d=32, seed=0):
+    rng = np.random.default_rng(seed)
+    return normalize_rows(rng.standard_normal((n, d)).astype(np.float32))
+
+
+def test_quantized_scores_match_dequantized_product(monkeypatch):
+    monkeypatch.setattr(compression, "SCORE_CHUNK_ROWS", 7)
+    vectors = make_vectors()
+    compressor = EmbeddingCompressor.fit(vectors, dim=8, quantize=True)
+    codes = compressor.encode(vectors)
+    assert codes.dtype == np.int8
+
+    query = vectors[0]
+    expected = (codes.astype(np.float32) * compressor.scale) @ compressor.project(query, center=False)
+    assert np.allclose(compressor.score(codes, query), expected, atol=1e-5)
+
+
+def test_pca_scores_preserve_ranking_without_reduction():
+    vectors = make_vectors()
+    compressor = EmbeddingCompressor.fit(vectors, dim=32)
+    query = vectors[5]
+    assert np.array_equal(
+        np.argsort(-compressor.score(compressor.encode(vectors), query))[:10],
+        np.argsort(-(vectors @ query))[:10],
+    )
+
+
+def test_measure_recall_excludes_the_query_itself():
+    vectors = make_vectors()
+    # Keeping one component discards almost everything, so recall must not look perfect.
+    report = measure_recall(EmbeddingCompressor.fit(vectors, dim=1), vectors, k=10, rerank=5)
+    assert report["rerank_recall"] < 0.5
+    assert report["recall_at_k"] < 0.5
+
+
+def test_fit_catalog_compressor_skips_settings_that_do_not_shrink(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_PCA_DIM", "64")
+    monkeypatch.setenv("EMBEDDING_QUANTIZE", "false")
+    db = FakeMongoClient()["match_cause_db"]
+    db["events"].insert_many([{"embedded": v.tolist()} for v in make_vectors()])
+    db["models"].insert_one(EmbeddingCompressor.fit(make_vectors(), dim=8).to_document())
+
+    assert compression.fit_catalog_compressor(db) is None
+    assert db["models"].find_one({"_id": compression.COMPRESSOR_ID}) is None
+    assert compression.load_compressor(db) is None
+
+
+def test_load_compressor_ignores_centering_only_compressors(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_PCA_DIM", "64")
+    db = FakeMongoClient()["match_cause_db"]
+    db["models"].insert_one(EmbeddingCompressor.fit(make_vectors(), dim=64).to_document())
+    assert compression.load_compressor(db) is None
+
+
+def test_import_reports_compression_failure_without_failing(monkeypatch, tmp_path):
+    monkeypatch.setenv("CATALOG_GENERATION_TTL", "0")
+    client = FakeMongoClient()
+    monkeypatch.setattr(functions, "get_mongo_client", lambda: client)
+
+    def failing_fit(db):
+        raise MemoryError("SVD ran out of memory")
+
+    monkeypatch.setattr(functions, "fit_catalog_compressor", failing_fit)
+    path = tmp_path / "events.csv"
+    path.write_text(
+        "name,location,date,time,description,category,link,embedded\n"
+        'Park cleanup,Park,2025-04-05,10:00,Pick up litter,environment,http://example.org,"[1.0, 0.0]"\n'
+    )
+
+    response = asyncio.run(functions.import_csv_endpoint(str(path)))
+    assert response["message"] == "Inserted 1 documents into the database."
+    assert response["compression"] == {"error": "SVD ran out of memory"}
+    assert client["match_cause_db"]["events"].estimated_document_count() == 1
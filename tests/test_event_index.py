@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
+import pytest
+from bson import ObjectId
+from app.loadtest.fake_mongo import FakeMongoClient
+from app.services.event_index import (
+    EventIndex,
+    bitset_to_ordinals,
+    get_event_index,
+    ordinals_to_bitset,
+    parse_event_timestamp,
+    to_event_timestamp,
+)
+
+CHICAGO = ZoneInfo("America/Chicago")
+
+
+def make_event(category, date="", time="", embedded=(1.0, 0.0)):
+    return {"_id": ObjectId(), "category": category, "date": date, "time": time, "embedded": list(embedded)}
+
+
+def test_bitset_round_trip():
+    ordinals = [0, 3, 8, 9, 63, 64, 99]
+    bits = ordinals_to_bitset(ordinals, 100)
+    assert bits == sum(1 << o for o in ordinals)
+    assert bitset_to_ordinals(bits, 100).tolist() == ordinals
+
+
+def test_bitset_empty():
+    assert ordinals_to_bitset([], 0) == 0
+    assert ordinals_to_bitset([], 10) == 0
+    assert bitset_to_ordinals(0, 10).tolist() == []
+
+
+@pytest.mark.parametrize("date, time, expected", [
+    ("2025-04-05", "14:30", datetime(2025, 4, 5, 14, 30, tzinfo=CHICAGO)),
+    ("04/05/2025", "2:30 PM", datetime(2025, 4, 5, 14, 30, tzinfo=CHICAGO)),
+    ("April 5, 2025", "9am - 11am", datetime(2025, 4, 5, 9, 0, tzinfo=CHICAGO)),
+    ("Saturday, April 5, 2025", "", datetime(2025, 4, 5, tzinfo=CHICAGO)),
+    ("2025-04-05", "sometime", datetime(2025, 4, 5, tzinfo=CHICAGO)),
+])
+def test_parse_event_timestamp(monkeypatch, date, time, expected):
+    monkeypatch.setenv("EVENT_TIMEZONE", "America/Chicago")
+    assert parse_event_timestamp(date, time) == expected.timestamp()
+
+
+def test_parse_event_timestamp_uses_configured_timezone(monkeypatch):
+    monkeypatch.setenv("EVENT_TIMEZONE", "UTC")
+    assert parse_event_timestamp("2025-04-05", "14:30") == datetime(2025, 4, 5, 14, 30, tzinfo=timezone.utc).timestamp()
+    monkeypatch.setenv("EVENT_TIMEZONE", "Asia/Tokyo")
+    assert parse_event_timestamp("2025-04-05", "14:30") == datetime(2025, 4, 5, 5, 30, tzinfo=timezone.utc).timestamp()
+
+
+def test_to_event_timestamp_keeps_aware_datetimes(monkeypatch):
+    monkeypatch.setenv("EVENT_TIMEZONE", "Asia/Tokyo")
+    moment = datetime(2025, 4, 5, 14, 30, tzinfo=timezone.utc)
+    assert to_event_timestamp(moment) == moment.timestamp()
+
+
+@pytest.mark.parametrize("date", ["", "soon", "2025-13-40"])
+def test_parse_event_timestamp_rejects_unparseable_dates(date):
+    assert parse_event_timestamp(date, "10:00") is None
+
+
+@pytest.fixture
+def index():
+    docs = [
+        make_event(["Health"], "2025-04-01"),
+        make_event(["education", "health"], "2025-04-10"),
+        make_event(["Environment"], "2025-05-01"),
+        make_event(["education"], "not a date"),
+        make_event(["health"], "2025-04-05", embedded=()),
+    ]
+    return EventIndex(docs, generation=(0, len(docs)))
+
+
+def test_candidates_without_filters_skips_events_without_embeddings(index):
+    assert index.candidates().tolist() == [0, 1, 2, 3]
+
+
+def test_candidates_counts_repeated_categories_once():
+    index = EventIndex([make_event(["Health", "health "])], generation=(0, 1))
+    assert index.candidates(["health"]).tolist() == [0]
+
+
+def test_candidates_by_category_is_case_insensitive_union(index):
+    assert index.candidates(["HEALTH"]).tolist() == [0, 1]
+    assert index.candidates(["health", "environment"]).tolist() == [0, 1, 2]
+    assert index.candidates(["unknown"]).tolist() == []
+
+
+def test_candidates_by_date_range(index):
+    start = to_event_timestamp(datetime(2025, 4, 5))
+    end = to_event_timestamp(datetime(2025, 4, 30))
+    assert index.candidates(start=start).tolist() == [1, 2]
+    assert index.candidates(end=end).tolist() == [0, 1]
+    assert index.candidates(start=start, end=end).tolist() == [1]
+
+
+def test_candidates_intersects_category_and_date(index):
+    start = to_event_timestamp(datetime(2025, 4, 5))
+    assert index.candidates(["health"], start=start).tolist() == [1]
+    assert index.candidates(["education"], start=start).tolist() == [1]
+
+
+def test_score_uses_unit_vectors(index):
+    query = np.array([1.0, 0.0], dtype=np.float32)
+    assert np.allclose(index.score(index.candidates(), query), 1.0)
+
+
+def test_get_event_index_sees_events_inserted_elsewhere(monkeypatch):
+    monkeypatch.setenv("CATALOG_GENERATION_TTL", "0")
+    collection = FakeMongoClient()["match_cause_db"]["events"]
+    collection.insert_one(make_event(["health"]))
+    assert get_event_index(collection).size == 1
+
+    collection.insert_one(make_event(["education"]))
+    assert get_event_index(collection).size == 2
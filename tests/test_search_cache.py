@@ -0,0 +1,75 @@
+import numpy as np
+from app.services.search_cache import SearchResultCache
+
+GENERATION = (1, 10)
+
+
+def unit(vector):
+    return vector / np.linalg.norm(vector)
+
+
+def test_get_returns_stored_result():
+    cache = SearchResultCache()
+    key = cache.make_key([1.0, 2.0, 3.0])
+    assert cache.get(key, GENERATION) is None
+    cache.put(key, {"similarity": 1.0}, GENERATION)
+    assert cache.get(key, GENERATION) == {"similarity": 1.0}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used():
+    cache = SearchResultCache(max_entries=2)
+    cache.get("warm", GENERATION)
+    cache.put("a", 1, GENERATION)
+    cache.put("b", 2, GENERATION)
+    assert cache.get("a", GENERATION) == 1
+    cache.put("c", 3, GENERATION)
+
+    assert cache.get("b", GENERATION) is None
+    assert cache.get("a", GENERATION) == 1
+    assert cache.get("c", GENERATION) == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_new_generation_invalidates_entries():
+    cache = SearchResultCache()
+    cache.get("key", GENERATION)
+    cache.put("key", "old", GENERATION)
+    assert cache.get("key", (2, 11)) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_put_drops_results_from_a_stale_generation():
+    cache = SearchResultCache()
+    cache.get("key", (2, 11))
+    cache.put("key", "stale", GENERATION)
+    assert cache.get("key", (2, 11)) is None
+
+
+def test_key_ignores_scale_and_depends_on_filters():
+    cache = SearchResultCache()
+    vector = np.random.default_rng(0).standard_normal(64)
+    assert cache.make_key(vector) == cache.make_key(vector * 7.5)
+    assert cache.make_key(vector, categories=["health"]) != cache.make_key(vector, categories=["arts"])
+    assert cache.make_key(vector, start=None) != cache.make_key(vector, start=1.0)
+
+
+def test_near_duplicate_embeddings_usually_share_a_key():
+    cache = SearchResultCache()
+    rng = np.random.default_rng(1)
+    shared = 0
+    for _ in range(200):
+        vector = unit(rng.standard_normal(384))
+        shared += cache.make_key(vector) == cache.make_key(vector + rng.standard_normal(384) * 5e-4)
+    assert shared >= 160
+
+
+def test_dissimilar_embeddings_rarely_share_a_key():
+    cache = SearchResultCache()
+    rng = np.random.default_rng(2)
+    shared = sum(
+        cache.make_key(rng.standard_normal(384)) == cache.make_key(rng.standard_normal(384))
+        for _ in range(200)
+    )
+    assert shared == 0
@@ -0,0 +1,69 @@
+import numpy as np
+from app.loadtest.fake_mongo import FakeMongoClient
+from app.services import text_embedding
+from app.services.text_embedding import content_hash, embed_interests, embed_texts, fill_missing_embeddings
+
+
+def make_cause(name, embedded=()):
+    return {"name": name, "description": "Volunteer event", "category": ["community"], "embedded": list(embedded)}
+
+
+def events_collection():
+    return FakeMongoClient()["match_cause_db"]["events"]
+
+
+def test_embedding_does_not_depend_on_the_batch():
+    alone = embed_texts(["park cleanup"], 16)[0]
+    batched = embed_texts(["food drive", "park cleanup", "park tour"], 16)[1]
+    assert np.allclose(alone, batched)
+    assert np.isclose(np.linalg.norm(alone), 1.0)
+
+
+def test_interests_share_the_event_weighting():
+    assert np.allclose(embed_interests(["park", "cleanup"], 16), embed_texts(["park cleanup"], 16)[0])
+
+
+def test_fill_missing_embeddings_reuses_stored_vectors():
+    collection = events_collection()
+    first = [make_cause("Park cleanup"), make_cause("Food drive")]
+    assert fill_missing_embeddings(first, collection) == 2
+    collection.insert_many(first)
+
+    again = [make_cause("Park cleanup"), make_cause("Book swap")]
+    assert fill_missing_embeddings(again, collection) == 1
+    assert again[0]["embedded"] == first[0]["embedded"]
+    assert again[0]["content_hash"] == first[0]["content_hash"]
+
+
+def test_fill_missing_embeddings_skips_catalogs_with_model_embeddings():
+    collection = events_collection()
+    collection.insert_one(make_cause("Imported", embedded=[0.1, 0.2, 0.3]))
+
+    causes = [make_cause("Park cleanup")]
+    assert fill_missing_embeddings(causes, collection) == 0
+    assert causes[0]["embedded"] == []
+
+
+def test_fill_missing_embeddings_skips_batches_with_model_embeddings():
+    causes = [make_cause("Imported", embedded=[0.1, 0.2]), make_cause("Park cleanup")]
+    assert fill_missing_embeddings(causes, events_collection()) == 0
+    assert causes[1]["embedded"] == []
+
+
+def test_embedding_is_the_same_in_chunks(monkeypatch):
+    texts = [f"event {i} park cleanup food drive {i % 7}" for i in range(10)]
+    whole = embed_texts(texts, 16)
+    monkeypatch.setattr(text_embedding, "EMBED_CHUNK_ROWS", 3)
+    assert np.allclose(embed_texts(texts, 16), whole)
+
+
+def test_content_hash_includes_the_pipeline_version(monkeypatch):
+    before = content_hash("park cleanup", 16)
+    monkeypatch.setattr(text_embedding, "PIPELINE_VERSION", text_embedding.PIPELINE_VERSION + 1)
+    assert content_hash("park cleanup", 16) != before
+
+
+def test_fill_missing_embeddings_indexes_content_hash():
+    collection = events_collection()
+    fill_missing_embeddings([make_cause("Park cleanup")], collection)
+    assert "content_hash_1" in collection.index_information()